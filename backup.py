@@ -0,0 +1,164 @@
+"""
+Модуль для резервного копирования базы данных.
+Здесь находятся функции для создания сжатых снимков базы на ходу (без остановки бота)
+и для восстановления базы из снимка при запуске.
+"""
+import asyncio
+import glob
+import gzip
+import os
+import shutil
+import sqlite3
+import time
+from datetime import datetime
+
+from config import DATABASE_NAME, BACKUP_DIR, BACKUP_KEEP, BACKUP_PAGES_PER_STEP, BACKUP_STEP_PAUSE
+
+# Блокировка, чтобы ручное и плановое копирование не выполнялись одновременно
+_backup_lock = asyncio.Lock()
+
+
+async def create_backup() -> str:
+    """
+    Создает сжатый снимок базы данных, проверяет его и удаляет старые снимки.
+    Копирование выполняется в отдельном потоке, поэтому обработчики сообщений
+    продолжают работать, пока идет копирование.
+
+    Returns:
+        Путь к созданному файлу снимка
+    """
+    async with _backup_lock:
+        return await asyncio.to_thread(_create_backup)
+
+
+def _create_backup() -> str:
+    """
+    Создает снимок базы данных (выполняется в отдельном потоке).
+    """
+    os.makedirs(BACKUP_DIR, exist_ok=True)
+
+    # Микросекунды в имени не дают двум снимкам, созданным в одну секунду, получить одно имя
+    timestamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+    snapshot_path = os.path.join(BACKUP_DIR, f"tasks-{timestamp}.db")
+
+    # Никогда не перезаписываем уже существующий снимок
+    if os.path.exists(snapshot_path) or os.path.exists(snapshot_path + '.gz'):
+        raise FileExistsError(f"Снимок {snapshot_path} уже существует")
+
+    try:
+        source = sqlite3.connect(DATABASE_NAME)
+        target = sqlite3.connect(snapshot_path)
+
+        try:
+            # Копируем базу небольшими порциями страниц через SQLite backup API.
+            # Между шагами база не заблокирована, и обработчики могут записывать задачи
+            # (если данные изменятся во время копирования, SQLite начнет копирование заново)
+            source.backup(target, pages=BACKUP_PAGES_PER_STEP, progress=_pause_between_steps)
+
+            # Проверяем, что снимок не поврежден
+            result = target.execute("PRAGMA integrity_check").fetchone()[0]
+        finally:
+            source.close()
+            target.close()
+
+        if result != "ok":
+            raise RuntimeError(f"Снимок базы данных поврежден: {result}")
+
+        # Сжимаем снимок
+        try:
+            with open(snapshot_path, 'rb') as snapshot_file, gzip.open(snapshot_path + '.gz', 'wb') as gzip_file:
+                shutil.copyfileobj(snapshot_file, gzip_file)
+        except BaseException:
+            # Недописанный сжатый снимок нельзя оставлять: его приняли бы за готовую копию
+            _remove_if_exists(snapshot_path + '.gz')
+            raise
+    finally:
+        # Несжатая копия не нужна ни после сжатия, ни после ошибки
+        # (list_backups ищет только .db.gz, поэтому такие файлы иначе никогда бы не удалились)
+        _remove_if_exists(snapshot_path)
+
+    # Удаляем самые старые снимки, оставляя BACKUP_KEEP последних
+    for old_path in list_backups()[:-BACKUP_KEEP]:
+        os.remove(old_path)
+
+    return snapshot_path + '.gz'
+
+
+def _remove_if_exists(path: str):
+    """
+    Удаляет файл, если он существует.
+    """
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def _pause_between_steps(status, remaining, total):
+    """
+    Вызывается после каждого шага копирования.
+    Небольшая пауза дает обработчикам сообщений записать задачи.
+    """
+    time.sleep(BACKUP_STEP_PAUSE)
+
+
+def list_backups() -> list:
+    """
+    Получает список снимков базы данных.
+
+    Returns:
+        Список путей к снимкам, от старых к новым
+    """
+    # Имена снимков содержат дату и время, поэтому сортировка по имени - это сортировка по времени
+    return sorted(glob.glob(os.path.join(BACKUP_DIR, "tasks-*.db.gz")))
+
+
+def restore_backup(snapshot_path: str):
+    """
+    Заменяет базу данных содержимым снимка.
+    Вызывается при запуске, до того как бот начнет работать с базой.
+    Текущая база сохраняется рядом с именем <база>.before-restore.
+
+    Args:
+        snapshot_path: Путь к сжатому снимку или "latest" для самого свежего снимка
+
+    Returns:
+        Путь к снимку, из которого восстановлена база
+    """
+    if snapshot_path == "latest":
+        backups = list_backups()
+        if not backups:
+            raise FileNotFoundError(f"В папке {BACKUP_DIR} нет снимков базы данных")
+        snapshot_path = backups[-1]
+
+    restored_path = DATABASE_NAME + '.restore'
+
+    try:
+        # Распаковываем снимок во временный файл рядом с базой
+        with gzip.open(snapshot_path, 'rb') as gzip_file, open(restored_path, 'wb') as restored_file:
+            shutil.copyfileobj(gzip_file, restored_file)
+
+        # Проверяем снимок перед тем, как подменять им базу
+        conn = sqlite3.connect(restored_path)
+        try:
+            result = conn.execute("PRAGMA integrity_check").fetchone()[0]
+        finally:
+            conn.close()
+
+        if result != "ok":
+            raise RuntimeError(f"Снимок базы данных поврежден: {result}")
+    except BaseException:
+        # Недораспакованный или поврежденный снимок не должен оставаться рядом с базой
+        _remove_if_exists(restored_path)
+        raise
+
+    # Сохраняем текущую базу на случай, если восстановление нужно будет отменить
+    if os.path.exists(DATABASE_NAME):
+        shutil.copy2(DATABASE_NAME, DATABASE_NAME + '.before-restore')
+
+    # Журнал старой базы не должен примениться к восстановленной
+    if os.path.exists(DATABASE_NAME + '-journal'):
+        os.remove(DATABASE_NAME + '-journal')
+
+    # Подменяем базу одной операцией: файл базы никогда не бывает записан наполовину
+    os.replace(restored_path, DATABASE_NAME)
+
+    return snapshot_path
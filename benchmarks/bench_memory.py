@@ -0,0 +1,120 @@
+"""
+Бенчмарк памяти для чтения задач из базы данных.
+Сравнивает пиковое потребление памяти при чтении 100 000 задач:
+- старый get_all_tasks: fetchall() возвращает список кортежей;
+- новый get_all_tasks: список записей Task (__slots__);
+- iter_tasks: ленивый перебор порциями через fetchmany, без списка.
+
+Запуск (из корня проекта):
+    python benchmarks/bench_memory.py
+"""
+import functools
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Добавляем корень проекта в путь поиска модулей, чтобы импортировать database
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database  # noqa: E402
+
+# Количество задач в тестовой базе
+ROWS = 100_000
+
+# ID чата и пользователя, которым принадлежат тестовые задачи
+CHAT_ID = 1
+USER_ID = 1
+
+
+def fill_database(rows: int):
+    """
+    Создает таблицу и заполняет её тестовыми задачами.
+    """
+    database.init_database()
+
+    conn = sqlite3.connect(database.DATABASE_NAME)
+    conn.executemany('''
+        INSERT INTO tasks (text, user, chat_id, category, created_at)
+        VALUES (?, ?, ?, ?, ?)
+    ''', (
+        (f"Тестовая задача номер {i}", USER_ID, CHAT_ID, "Backend", "2025-01-01 12:00:00")
+        for i in range(rows)
+    ))
+    conn.commit()
+    conn.close()
+
+
+def get_all_tasks_tuples(chat_id: int, user_id: int):
+    """
+    Прежняя реализация get_all_tasks: все строки сразу через fetchall() в виде кортежей.
+    """
+    conn = sqlite3.connect(database.DATABASE_NAME)
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        SELECT id, text, user, category, created_at, status, assignee
+        FROM tasks
+        WHERE chat_id = ? AND user = ? AND deleted_at IS NULL
+        ORDER BY id
+    ''', (chat_id, user_id))
+
+    tasks = cursor.fetchall()
+
+    conn.close()
+
+    return tasks
+
+
+def consume_list(get_tasks):
+    """
+    Получает список задач и перебирает его (как это делает обработчик).
+    """
+    count = 0
+    for _ in get_tasks(CHAT_ID, USER_ID):
+        count += 1
+    return count
+
+
+def consume_iterator():
+    """
+    Перебирает задачи ленивым итератором, не сохраняя их.
+    """
+    count = 0
+    for _ in database.iter_tasks(CHAT_ID, user_id=USER_ID, include_done=True):
+        count += 1
+    return count
+
+
+def measure(name: str, func):
+    """
+    Запускает функцию и печатает пиковое потребление памяти и время.
+    """
+    tracemalloc.start()
+    started = time.perf_counter()
+
+    count = func()
+
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:<40} {count:>8} строк  пик {peak / 1024 / 1024:8.2f} МБ  {elapsed:6.2f} с")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Работаем с временной базой, чтобы не трогать tasks.db
+        database.DATABASE_NAME = os.path.join(tmp_dir, "bench.db")
+        fill_database(ROWS)
+
+        print(f"Чтение {ROWS} задач (размер порции fetchmany: {database.FETCH_BATCH_SIZE})\n")
+        measure("get_all_tasks (старый, кортежи)", lambda: consume_list(get_all_tasks_tuples))
+        measure("get_all_tasks (записи Task)", lambda: consume_list(functools.partial(database.get_all_tasks, include_done=True)))
+        measure("iter_tasks (ленивый перебор)", consume_iterator)
+
+
+if __name__ == "__main__":
+    main()
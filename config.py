@@ -15,3 +15,49 @@ BOT_TOKEN = os.getenv('BOT_TOKEN')
 # Имя файла базы данных
 DATABASE_NAME = 'tasks.db'
 
+# Максимальный суммарный размер (в байтах) закэшированных CSV-выгрузок
+# При превышении лимита самые давно использованные выгрузки удаляются из кэша
+EXPORT_CACHE_MAX_BYTES = 5 * 1024 * 1024
+
+# Сколько секунд после удаления задачу можно восстановить командой /undo
+UNDO_WINDOW_SECONDS = 5 * 60
+
+# Как часто (в секундах) запускается фоновая очистка удаленных задач
+COMPACTION_INTERVAL_SECONDS = 60 * 60
+
+# Сколько удаленных задач окончательно стирается за один шаг очистки
+COMPACTION_BATCH_SIZE = 100
+
+# Сколько свободных страниц файла базы освобождается за один шаг очистки
+COMPACTION_VACUUM_PAGES = 100
+
+# Сколько выполненных задач показывается на одной странице /list_done
+DONE_PAGE_SIZE = 10
+
+# ID администраторов бота через запятую (переменная окружения ADMIN_IDS)
+# Только администраторы могут запускать резервное копирование командой /backup
+ADMIN_IDS = [int(admin_id) for admin_id in os.getenv('ADMIN_IDS', '').split(',') if admin_id.strip()]
+
+# Папка для резервных копий базы данных
+BACKUP_DIR = 'backups'
+
+# Как часто (в секундах) создается резервная копия базы данных
+BACKUP_INTERVAL_SECONDS = 24 * 60 * 60
+
+# Через сколько секунд повторить резервное копирование, если оно завершилось ошибкой
+BACKUP_RETRY_SECONDS = 10 * 60
+
+# Сколько последних резервных копий хранится (более старые удаляются)
+BACKUP_KEEP = 7
+
+# Сколько страниц базы копируется за один шаг резервного копирования
+BACKUP_PAGES_PER_STEP = 100
+
+# Пауза (в секундах) между шагами резервного копирования, чтобы не мешать записи задач
+BACKUP_STEP_PAUSE = 0.01
+
+# Сколько строк читается из базы за один раз при переборе задач
+FETCH_BATCH_SIZE = 500
+
+# Сколько активных задач показывается на одной странице /list и /list_category
+TASKS_PAGE_SIZE = 10
@@ -2,34 +2,129 @@
 Модуль для работы с базой данных SQLite.
 Здесь находятся функции для создания таблицы, добавления, удаления и получения задач.
 """
+import os
 import sqlite3
-from datetime import datetime
-from config import DATABASE_NAME
+from datetime import datetime, timedelta
+from config import DATABASE_NAME, UNDO_WINDOW_SECONDS, FETCH_BATCH_SIZE
+from export_cache import invalidate_chat_exports
+
+# Возможные статусы задачи: открыта, в работе, выполнена
+TASK_STATUSES = ('open', 'in_progress', 'done')
+
+# Формат времени удаления задачи. Микросекунды нужны, чтобы /undo различал
+# задачи, удаленные в одну и ту же секунду, и восстанавливал последнюю из них.
+# Строки в этом формате сравниваются и сортируются так же, как моменты времени.
+DELETED_AT_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
+# Версии данных по чатам: версия чата увеличивается при каждом изменении его задач
+# (добавление, удаление, восстановление).
+# По ней кэш выгрузок понимает, что сохраненный CSV устарел.
+_data_versions = {}
+
+
+class Task:
+    """
+    Запись о задаче, прочитанная из базы данных.
+    Поля доступны по имени: task.id, task.text, task.status и т.д.
+    __slots__ запрещает объекту заводить словарь атрибутов, поэтому запись
+    занимает в памяти не больше кортежа с теми же полями.
+    """
+    __slots__ = ('id', 'text', 'user', 'category', 'created_at', 'status', 'assignee')
+    
+    def __init__(self, id, text, user, category, created_at, status, assignee):
+        self.id = id
+        self.text = text
+        self.user = user
+        self.category = category
+        self.created_at = created_at
+        self.status = status
+        self.assignee = assignee
+    
+    def __repr__(self):
+        return f"Task(id={self.id}, category={self.category!r}, status={self.status!r})"
+
+
+def _task_row_factory(cursor, row):
+    """
+    Превращает строку результата запроса в запись Task.
+    Используется как conn.row_factory для запросов, которые выбирают поля задачи
+    в порядке: id, text, user, category, created_at, status, assignee.
+    """
+    return Task(*row)
+
+
+def _iter_rows(cursor):
+    """
+    Лениво перебирает строки результата запроса порциями по FETCH_BATCH_SIZE.
+    В памяти одновременно находится только одна порция, а не весь результат.
+    """
+    while True:
+        rows = cursor.fetchmany(FETCH_BATCH_SIZE)
+        if not rows:
+            break
+        yield from rows
+
+
+def get_data_version(chat_id: int) -> int:
+    """
+    Возвращает текущую версию данных чата.
+    
+    Args:
+        chat_id: ID чата Telegram
+    
+    Returns:
+        Число, которое меняется после каждой записи в задачи этого чата
+    """
+    return _data_versions.get(chat_id, 0)
+
+
+def _bump_data_version(chat_id: int):
+    """
+    Увеличивает версию данных чата после изменения его задач
+    и удаляет устаревшие выгрузки этого чата из кэша.
+    """
+    _data_versions[chat_id] = _data_versions.get(chat_id, 0) + 1
+    invalidate_chat_exports(chat_id)
 
 
 def init_database():
     """
     Инициализация базы данных.
     Создает таблицу tasks, если она еще не существует.
-    Добавляет поле category, если его еще нет (для существующих баз данных).
+    Добавляет поля category, deleted_at, chat_id, status и assignee,
+    если их еще нет (для существующих баз данных).
+    Создает частичные индексы и включает режим инкрементальной очистки файла.
     """
     # Подключаемся к базе данных (файл будет создан автоматически, если его нет)
     conn = sqlite3.connect(DATABASE_NAME)
     cursor = conn.cursor()
     
+    # Включаем инкрементальный auto_vacuum, чтобы освобожденные страницы
+    # можно было возвращать файловой системе командой PRAGMA incremental_vacuum
+    # (для новой базы режим применяется сразу при создании первой таблицы)
+    cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    
     # Создаем таблицу tasks с полями:
     # id - уникальный идентификатор задачи (автоинкремент)
     # text - текст задачи
     # user - идентификатор пользователя Telegram
+    # chat_id - идентификатор чата Telegram, в котором создана задача
     # category - категория задачи (DataBase, Frontend, Backend, Business)
     # created_at - дата и время создания задачи
+    # status - статус задачи (open, in_progress, done)
+    # assignee - идентификатор исполнителя задачи (NULL - исполнитель не назначен)
+    # deleted_at - дата и время удаления задачи (NULL - задача не удалена)
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS tasks (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             text TEXT NOT NULL,
             user INTEGER NOT NULL,
+            chat_id INTEGER NOT NULL,
             category TEXT NOT NULL DEFAULT 'Business',
-            created_at TEXT NOT NULL
+            created_at TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'open',
+            assignee INTEGER,
+            deleted_at TEXT
         )
     ''')
     
@@ -41,18 +136,81 @@ def init_database():
         # Добавляем колонку category, если её нет
         cursor.execute('ALTER TABLE tasks ADD COLUMN category TEXT NOT NULL DEFAULT "Business"')
     
-    # Сохраняем изменения и закрываем соединение
+    if 'deleted_at' not in columns:
+        # Добавляем колонку deleted_at для мягкого удаления задач
+        cursor.execute('ALTER TABLE tasks ADD COLUMN deleted_at TEXT')
+    
+    if 'chat_id' not in columns:
+        # Добавляем колонку chat_id для разделения задач по чатам
+        cursor.execute('ALTER TABLE tasks ADD COLUMN chat_id INTEGER')
+        # Старые задачи создавались в личном чате с ботом,
+        # а ID личного чата совпадает с ID пользователя
+        cursor.execute('UPDATE tasks SET chat_id = user WHERE chat_id IS NULL')
+    
+    if 'status' not in columns:
+        # Добавляем колонку status: все существующие задачи считаются открытыми
+        cursor.execute("ALTER TABLE tasks ADD COLUMN status TEXT NOT NULL DEFAULT 'open'")
+    
+    if 'assignee' not in columns:
+        # Добавляем колонку assignee для назначения исполнителя
+        cursor.execute('ALTER TABLE tasks ADD COLUMN assignee INTEGER')
+    
+    # Старые индексы больше не нужны: их заменяют индексы ниже
+    cursor.execute('DROP INDEX IF EXISTS idx_tasks_live_user')
+    cursor.execute('DROP INDEX IF EXISTS idx_tasks_live_category')
+    cursor.execute('DROP INDEX IF EXISTS idx_tasks_chat')
+    cursor.execute('DROP INDEX IF EXISTS idx_tasks_chat_category')
+    
+    # Частичные индексы только по активным задачам (не удаленным и не выполненным):
+    # списки /list и /list_category не читают ни удаленные, ни выполненные строки,
+    # а chat_id в начале индекса не дает запросам одного чата читать задачи других чатов
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_tasks_chat_active
+        ON tasks (chat_id, id) WHERE deleted_at IS NULL AND status != 'done'
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_tasks_chat_category_active
+        ON tasks (chat_id, category, id) WHERE deleted_at IS NULL AND status != 'done'
+    ''')
+    
+    # Частичный индекс по выполненным задачам - для постраничного списка /list_done
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_tasks_chat_done
+        ON tasks (chat_id, id) WHERE deleted_at IS NULL AND status = 'done'
+    ''')
+    
+    # Частичный индекс по всем живым задачам пользователя - для выгрузки в CSV
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_tasks_chat_user
+        ON tasks (chat_id, user, id) WHERE deleted_at IS NULL
+    ''')
+    
+    # Частичный индекс по удаленным задачам - для /undo и очистки старых удалений
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_tasks_deleted
+        ON tasks (deleted_at) WHERE deleted_at IS NOT NULL
+    ''')
+    
+    # Сохраняем изменения
     conn.commit()
+    
+    # Для уже существующей базы режим auto_vacuum меняется только после VACUUM
+    cursor.execute("PRAGMA auto_vacuum")
+    if cursor.fetchone()[0] != 2:
+        cursor.execute("VACUUM")
+    
+    # Закрываем соединение
     conn.close()
 
 
-def add_task(text: str, user_id: int, category: str = "Business") -> int:
+def add_task(text: str, user_id: int, chat_id: int, category: str = "Business") -> int:
     """
     Добавляет новую задачу в базу данных.
     
     Args:
         text: Текст задачи
         user_id: ID пользователя Telegram
+        chat_id: ID чата Telegram, в котором создается задача
         category: Категория задачи (DataBase, Frontend, Backend, Business)
     
     Returns:
@@ -66,9 +224,9 @@ def add_task(text: str, user_id: int, category: str = "Business") -> int:
     
     # Вставляем новую задачу в таблицу
     cursor.execute('''
-        INSERT INTO tasks (text, user, category, created_at)
-        VALUES (?, ?, ?, ?)
-    ''', (text, user_id, category, created_at))
+        INSERT INTO tasks (text, user, chat_id, category, created_at)
+        VALUES (?, ?, ?, ?, ?)
+    ''', (text, user_id, chat_id, category, created_at))
     
     # Получаем ID созданной задачи
     task_id = cursor.lastrowid
@@ -77,16 +235,22 @@ def add_task(text: str, user_id: int, category: str = "Business") -> int:
     conn.commit()
     conn.close()
     
+    # Данные изменились - старые выгрузки больше не актуальны
+    _bump_data_version(chat_id)
+    
     return task_id
 
 
-def delete_task(task_id: int, user_id: int) -> bool:
+def delete_task(task_id: int, user_id: int, chat_id: int) -> bool:
     """
-    Удаляет задачу по ID, если она принадлежит пользователю.
+    Удаляет задачу по ID, если она принадлежит пользователю и находится в указанном чате.
+    Задача не удаляется из таблицы сразу, а помечается временем удаления,
+    чтобы её можно было восстановить командой /undo.
     
     Args:
         task_id: ID задачи для удаления
         user_id: ID пользователя Telegram
+        chat_id: ID чата Telegram
     
     Returns:
         True если задача была удалена, False если задача не найдена или не принадлежит пользователю
@@ -94,11 +258,15 @@ def delete_task(task_id: int, user_id: int) -> bool:
     conn = sqlite3.connect(DATABASE_NAME)
     cursor = conn.cursor()
     
-    # Удаляем задачу только если она принадлежит пользователю
+    # Получаем текущую дату и время в формате строки
+    deleted_at = datetime.now().strftime(DELETED_AT_FORMAT)
+    
+    # Помечаем задачу удаленной только если она принадлежит пользователю и этому чату
     cursor.execute('''
-        DELETE FROM tasks 
-        WHERE id = ? AND user = ?
-    ''', (task_id, user_id))
+        UPDATE tasks 
+        SET deleted_at = ?
+        WHERE id = ? AND user = ? AND chat_id = ? AND deleted_at IS NULL
+    ''', (deleted_at, task_id, user_id, chat_id))
     
     # Проверяем, была ли удалена хотя бы одна строка
     deleted = cursor.rowcount > 0
@@ -107,38 +275,195 @@ def delete_task(task_id: int, user_id: int) -> bool:
     conn.commit()
     conn.close()
     
+    if deleted:
+        # Данные изменились - старые выгрузки больше не актуальны
+        _bump_data_version(chat_id)
+    
     return deleted
 
 
-def get_all_tasks(user_id: int = None):
+def iter_tasks(chat_id: int, user_id: int = None, include_done: bool = False, after_id: int = 0, limit: int = -1):
     """
-    Получает все задачи из базы данных.
+    Лениво перебирает задачи чата из базы данных.
+    Строки читаются из базы порциями, поэтому весь результат не держится в памяти.
     
     Args:
+        chat_id: ID чата Telegram
+        user_id: Если указан, перебирает только задачи этого пользователя.
+                 Если None, перебирает задачи всех пользователей чата.
+        include_done: Если True, перебирает и выполненные задачи.
+                      Если False, только активные (не выполненные).
+        after_id: Перебирать только задачи с ID больше этого (продолжение списка со следующей страницы)
+        limit: Максимальное количество задач (-1 - без ограничения)
+    
+    Yields:
+        Записи Task в порядке возрастания ID
+    """
+    # Собираем условия отбора: каждый параметр отвечает только за свое условие
+    conditions = ["chat_id = ?", "deleted_at IS NULL"]
+    params = [chat_id]
+    
+    if not include_done:
+        # Условие совпадает с условием частичных индексов активных задач,
+        # поэтому SQLite может их использовать
+        conditions.append("status != 'done'")
+    
+    if user_id is not None:
+        conditions.append("user = ?")
+        params.append(user_id)
+    
+    conditions.append("id > ?")
+    params.extend([after_id, limit])
+    
+    conn = sqlite3.connect(DATABASE_NAME)
+    conn.row_factory = _task_row_factory
+    cursor = conn.cursor()
+    
+    cursor.execute(f'''
+        SELECT id, text, user, category, created_at, status, assignee 
+        FROM tasks 
+        WHERE {" AND ".join(conditions)}
+        ORDER BY id
+        LIMIT ?
+    ''', params)
+    
+    try:
+        # Отдаем задачи по одной, читая их из базы порциями
+        yield from _iter_rows(cursor)
+    finally:
+        # Закрываем соединение, даже если перебор прервали раньше времени
+        conn.close()
+
+
+def get_all_tasks(chat_id: int, user_id: int = None, include_done: bool = False):
+    """
+    Получает задачи чата из базы данных.
+    Для больших списков лучше использовать iter_tasks, который не держит все задачи в памяти.
+    
+    Args:
+        chat_id: ID чата Telegram
         user_id: Если указан, возвращает только задачи этого пользователя.
-                 Если None, возвращает все задачи.
+                 Если None, возвращает задачи всех пользователей чата.
+        include_done: Если True, возвращает и выполненные задачи.
+                      Если False, только активные (не выполненные).
     
     Returns:
-        Список кортежей (id, text, user, category, created_at)
+        Список записей Task
+    """
+    return list(iter_tasks(chat_id, user_id, include_done))
+
+
+def iter_tasks_by_category(chat_id: int, category: str, after_id: int = 0, limit: int = -1):
+    """
+    Лениво перебирает активные (не выполненные) задачи чата по указанной категории.
+    
+    Args:
+        chat_id: ID чата Telegram
+        category: Категория задачи (DataBase, Frontend, Backend, Business)
+        after_id: Перебирать только задачи с ID больше этого (продолжение списка со следующей страницы)
+        limit: Максимальное количество задач (-1 - без ограничения)
+    
+    Yields:
+        Записи Task в порядке возрастания ID
     """
     conn = sqlite3.connect(DATABASE_NAME)
+    conn.row_factory = _task_row_factory
     cursor = conn.cursor()
     
-    if user_id:
-        # Получаем задачи конкретного пользователя
+    # Получаем активные задачи указанной категории в этом чате
+    cursor.execute('''
+        SELECT id, text, user, category, created_at, status, assignee 
+        FROM tasks 
+        WHERE chat_id = ? AND category = ? AND deleted_at IS NULL AND status != 'done' AND id > ?
+        ORDER BY id
+        LIMIT ?
+    ''', (chat_id, category, after_id, limit))
+    
+    try:
+        # Отдаем задачи по одной, читая их из базы порциями
+        yield from _iter_rows(cursor)
+    finally:
+        # Закрываем соединение, даже если перебор прервали раньше времени
+        conn.close()
+
+
+def get_tasks_by_category(chat_id: int, category: str):
+    """
+    Получает активные (не выполненные) задачи чата по указанной категории.
+    
+    Args:
+        chat_id: ID чата Telegram
+        category: Категория задачи (DataBase, Frontend, Backend, Business)
+    
+    Returns:
+        Список записей Task
+    """
+    return list(iter_tasks_by_category(chat_id, category))
+
+
+def get_task_by_id(task_id: int, chat_id: int):
+    """
+    Получает задачу чата по ID.
+    
+    Args:
+        task_id: ID задачи
+        chat_id: ID чата Telegram
+    
+    Returns:
+        Запись Task или None, если задача не найдена
+    """
+    conn = sqlite3.connect(DATABASE_NAME)
+    conn.row_factory = _task_row_factory
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        SELECT id, text, user, category, created_at, status, assignee 
+        FROM tasks 
+        WHERE id = ? AND chat_id = ? AND deleted_at IS NULL
+    ''', (task_id, chat_id))
+    
+    task = cursor.fetchone()
+    
+    conn.close()
+    
+    return task
+
+
+def get_done_tasks(chat_id: int, limit: int, before_id: int = None):
+    """
+    Получает одну страницу выполненных задач чата (от новых к старым).
+    
+    Args:
+        chat_id: ID чата Telegram
+        limit: Максимальное количество задач на странице
+        before_id: Если указан, возвращает задачи с ID меньше этого
+                   (следующая страница после задачи before_id)
+    
+    Returns:
+        Список записей Task
+    """
+    conn = sqlite3.connect(DATABASE_NAME)
+    conn.row_factory = _task_row_factory
+    cursor = conn.cursor()
+    
+    # Вместо OFFSET продолжаем с последнего показанного ID:
+    # так каждая страница читает из индекса только свои строки
+    if before_id:
         cursor.execute('''
-            SELECT id, text, user, category, created_at 
+            SELECT id, text, user, category, created_at, status, assignee 
             FROM tasks 
-            WHERE user = ?
-            ORDER BY id
-        ''', (user_id,))
+            WHERE chat_id = ? AND deleted_at IS NULL AND status = 'done' AND id < ?
+            ORDER BY id DESC
+            LIMIT ?
+        ''', (chat_id, before_id, limit))
     else:
-        # Получаем все задачи
         cursor.execute('''
-            SELECT id, text, user, category, created_at 
+            SELECT id, text, user, category, created_at, status, assignee 
             FROM tasks 
-            ORDER BY id
-        ''')
+            WHERE chat_id = ? AND deleted_at IS NULL AND status = 'done'
+            ORDER BY id DESC
+            LIMIT ?
+        ''', (chat_id, limit))
     
     # Получаем все результаты
     tasks = cursor.fetchall()
@@ -149,58 +474,209 @@ def get_all_tasks(user_id: int = None):
     return tasks
 
 
-def get_tasks_by_category(category: str):
+def set_task_status(task_id: int, chat_id: int, status: str) -> bool:
     """
-    Получает все задачи по указанной категории.
+    Меняет статус задачи.
     
     Args:
-        category: Категория задачи (DataBase, Frontend, Backend, Business)
+        task_id: ID задачи
+        chat_id: ID чата Telegram
+        status: Новый статус (open, in_progress, done)
     
     Returns:
-        Список кортежей (id, text, user, category, created_at)
+        True если статус изменен, False если задача не найдена
     """
+    if status not in TASK_STATUSES:
+        raise ValueError(f"Неизвестный статус задачи: {status}")
+    
     conn = sqlite3.connect(DATABASE_NAME)
     cursor = conn.cursor()
     
-    # Получаем все задачи указанной категории
     cursor.execute('''
-        SELECT id, text, user, category, created_at 
-        FROM tasks 
-        WHERE category = ?
-        ORDER BY id
-    ''', (category,))
+        UPDATE tasks 
+        SET status = ?
+        WHERE id = ? AND chat_id = ? AND deleted_at IS NULL
+    ''', (status, task_id, chat_id))
     
-    # Получаем все результаты
-    tasks = cursor.fetchall()
+    # Проверяем, была ли изменена хотя бы одна строка
+    updated = cursor.rowcount > 0
     
-    # Закрываем соединение
+    # Сохраняем изменения и закрываем соединение
+    conn.commit()
     conn.close()
     
-    return tasks
+    if updated:
+        # Данные изменились - старые выгрузки больше не актуальны
+        _bump_data_version(chat_id)
+    
+    return updated
 
 
-def get_task_by_id(task_id: int):
+def assign_task(task_id: int, chat_id: int, assignee_id: int) -> bool:
     """
-    Получает задачу по ID.
+    Назначает исполнителя задачи.
     
     Args:
         task_id: ID задачи
+        chat_id: ID чата Telegram
+        assignee_id: ID пользователя Telegram, который будет исполнителем
     
     Returns:
-        Кортеж (id, text, user, category, created_at) или None, если задача не найдена
+        True если исполнитель назначен, False если задача не найдена
     """
     conn = sqlite3.connect(DATABASE_NAME)
     cursor = conn.cursor()
     
     cursor.execute('''
-        SELECT id, text, user, category, created_at 
+        UPDATE tasks 
+        SET assignee = ?
+        WHERE id = ? AND chat_id = ? AND deleted_at IS NULL
+    ''', (assignee_id, task_id, chat_id))
+    
+    # Проверяем, была ли изменена хотя бы одна строка
+    updated = cursor.rowcount > 0
+    
+    # Сохраняем изменения и закрываем соединение
+    conn.commit()
+    conn.close()
+    
+    if updated:
+        # Данные изменились - старые выгрузки больше не актуальны
+        _bump_data_version(chat_id)
+    
+    return updated
+
+
+def restore_last_deleted_task(user_id: int, chat_id: int):
+    """
+    Восстанавливает последнюю удаленную пользователем задачу в чате,
+    если с момента удаления прошло не больше UNDO_WINDOW_SECONDS.
+    
+    Args:
+        user_id: ID пользователя Telegram
+        chat_id: ID чата Telegram
+    
+    Returns:
+        ID восстановленной задачи или None, если восстанавливать нечего
+    """
+    conn = sqlite3.connect(DATABASE_NAME)
+    cursor = conn.cursor()
+    
+    # Удаления старше этого момента уже нельзя отменить
+    cutoff = (datetime.now() - timedelta(seconds=UNDO_WINDOW_SECONDS)).strftime(DELETED_AT_FORMAT)
+    
+    # Ищем последнюю удаленную задачу пользователя в этом чате в пределах окна отмены
+    cursor.execute('''
+        SELECT id 
         FROM tasks 
-        WHERE id = ?
-    ''', (task_id,))
+        WHERE chat_id = ? AND user = ? AND deleted_at IS NOT NULL AND deleted_at >= ?
+        ORDER BY deleted_at DESC, id DESC
+        LIMIT 1
+    ''', (chat_id, user_id, cutoff))
     
-    task = cursor.fetchone()
+    row = cursor.fetchone()
+    task_id = None
+    
+    if row:
+        task_id = row[0]
+        # Снимаем пометку удаления
+        cursor.execute('''
+            UPDATE tasks 
+            SET deleted_at = NULL
+            WHERE id = ?
+        ''', (task_id,))
+        conn.commit()
     
     conn.close()
     
-    return task
+    if task_id is not None:
+        # Данные изменились - старые выгрузки больше не актуальны
+        _bump_data_version(chat_id)
+    
+    return task_id
+
+
+def purge_deleted_tasks(batch_size: int) -> int:
+    """
+    Окончательно удаляет из таблицы задачи, у которых истекло окно отмены.
+    За один вызов удаляется не больше batch_size строк, чтобы не держать
+    блокировку базы долго.
+    
+    Args:
+        batch_size: Максимальное количество строк для удаления за один вызов
+    
+    Returns:
+        Количество удаленных строк
+    """
+    conn = sqlite3.connect(DATABASE_NAME)
+    cursor = conn.cursor()
+    
+    # Удаления старше этого момента уже нельзя отменить
+    cutoff = (datetime.now() - timedelta(seconds=UNDO_WINDOW_SECONDS)).strftime(DELETED_AT_FORMAT)
+    
+    cursor.execute('''
+        DELETE FROM tasks 
+        WHERE id IN (
+            SELECT id 
+            FROM tasks 
+            WHERE deleted_at IS NOT NULL AND deleted_at < ?
+            LIMIT ?
+        )
+    ''', (cutoff, batch_size))
+    
+    purged = cursor.rowcount
+    
+    # Сохраняем изменения и закрываем соединение
+    conn.commit()
+    conn.close()
+    
+    return purged
+
+
+def incremental_vacuum(max_pages: int) -> int:
+    """
+    Возвращает файловой системе до max_pages свободных страниц базы данных.
+    
+    Args:
+        max_pages: Максимальное количество страниц для освобождения за один вызов
+    
+    Returns:
+        Количество свободных страниц, оставшихся в файле
+    """
+    conn = sqlite3.connect(DATABASE_NAME)
+    
+    # executescript выполняет PRAGMA до конца (обычный execute освобождает только одну страницу)
+    conn.executescript(f"PRAGMA incremental_vacuum({int(max_pages)})")
+    
+    freelist_count = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    
+    conn.close()
+    
+    return freelist_count
+
+
+def get_database_stats() -> dict:
+    """
+    Получает информацию о размере файла базы данных.
+    
+    Returns:
+        Словарь с ключами file_size (размер файла в байтах),
+        page_count (всего страниц) и freelist_count (свободных страниц)
+    """
+    conn = sqlite3.connect(DATABASE_NAME)
+    cursor = conn.cursor()
+    
+    cursor.execute("PRAGMA page_count")
+    page_count = cursor.fetchone()[0]
+    
+    cursor.execute("PRAGMA freelist_count")
+    freelist_count = cursor.fetchone()[0]
+    
+    conn.close()
+    
+    return {
+        "file_size": os.path.getsize(DATABASE_NAME),
+        "page_count": page_count,
+        "freelist_count": freelist_count,
+    }
 
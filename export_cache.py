@@ -0,0 +1,106 @@
+"""
+Модуль для кэширования выгрузок задач в CSV.
+Здесь хранятся уже сформированные CSV файлы и file_id, который Telegram
+возвращает после первой отправки файла. Повторный запрос той же выгрузки
+отправляется по file_id без повторного формирования и загрузки файла.
+"""
+from collections import OrderedDict
+from config import EXPORT_CACHE_MAX_BYTES
+
+# Кэш выгрузок: ключ - (область выгрузки, версия данных),
+# где область выгрузки - пара (ID чата, ID пользователя),
+# значение - словарь {"csv": байты файла, "file_id": ID файла в Telegram или None}
+# OrderedDict хранит порядок использования: в конце - самые свежие записи
+_exports = OrderedDict()
+
+# Суммарный размер CSV файлов, которые сейчас лежат в кэше
+_total_bytes = 0
+
+
+def get_export(scope, version: int):
+    """
+    Получает выгрузку из кэша.
+
+    Args:
+        scope: Область выгрузки (пара (ID чата, ID пользователя))
+        version: Версия данных, для которой нужна выгрузка
+
+    Returns:
+        Словарь {"csv": bytes, "file_id": str или None} или None, если выгрузки нет в кэше
+    """
+    key = (scope, version)
+    entry = _exports.get(key)
+
+    if entry is not None:
+        # Отмечаем запись как недавно использованную
+        _exports.move_to_end(key)
+
+    return entry
+
+
+def save_export(scope, version: int, csv_bytes: bytes):
+    """
+    Сохраняет сформированный CSV файл в кэш.
+    Выгрузки этого же чата для других версий данных удаляются.
+
+    Args:
+        scope: Область выгрузки (пара (ID чата, ID пользователя))
+        version: Версия данных, по которой сформирован файл
+        csv_bytes: Содержимое CSV файла
+    """
+    global _total_bytes
+
+    # Удаляем выгрузки этого чата для других версий данных
+    # (например, если задачи изменились, пока формировался этот CSV)
+    chat_id = scope[0]
+    for key in [key for key in _exports if key[0][0] == chat_id and key[1] != version]:
+        _remove(key)
+
+    key = (scope, version)
+    if key in _exports:
+        _remove(key)
+
+    _exports[key] = {"csv": csv_bytes, "file_id": None}
+    _total_bytes += len(csv_bytes)
+
+    # Удаляем самые давно использованные выгрузки, пока кэш не уложится в лимит
+    # Только что добавленную запись оставляем, даже если она одна больше лимита
+    while _total_bytes > EXPORT_CACHE_MAX_BYTES and len(_exports) > 1:
+        _remove(next(iter(_exports)))
+
+
+def set_export_file_id(scope, version: int, file_id):
+    """
+    Запоминает file_id, который Telegram вернул после отправки файла.
+
+    Args:
+        scope: Область выгрузки (пара (ID чата, ID пользователя))
+        version: Версия данных, по которой сформирован файл
+        file_id: ID файла в Telegram или None, чтобы забыть сохраненный ID
+    """
+    entry = _exports.get((scope, version))
+
+    if entry is not None:
+        entry["file_id"] = file_id
+
+
+def invalidate_chat_exports(chat_id: int):
+    """
+    Удаляет из кэша все выгрузки чата.
+    Вызывается после каждого изменения задач чата: сохраненные CSV больше не актуальны.
+
+    Args:
+        chat_id: ID чата Telegram
+    """
+    for key in [key for key in _exports if key[0][0] == chat_id]:
+        _remove(key)
+
+
+def _remove(key):
+    """
+    Удаляет запись из кэша и уменьшает счетчик занятого места.
+    """
+    global _total_bytes
+
+    entry = _exports.pop(key)
+    _total_bytes -= len(entry["csv"])
@@ -4,17 +4,238 @@
 """
 import csv
 import io
+import logging
+import os
 from aiogram import Router, F
 from aiogram.types import Message, BufferedInputFile, CallbackQuery
 from aiogram.filters import Command, StateFilter
 from aiogram.fsm.context import FSMContext
-from database import add_task, delete_task, get_all_tasks, get_tasks_by_category
+from aiogram.exceptions import TelegramBadRequest
+from database import (
+    add_task, delete_task, restore_last_deleted_task, iter_tasks, iter_tasks_by_category,
+    get_done_tasks, get_task_by_id, set_task_status, assign_task, get_data_version, TASK_STATUSES
+)
+from config import UNDO_WINDOW_SECONDS, DONE_PAGE_SIZE, TASKS_PAGE_SIZE, ADMIN_IDS
+from export_cache import get_export, save_export, set_export_file_id
+from backup import create_backup
 from states import TaskStates
-from keyboard import get_category_keyboard, get_category_filter_keyboard
+from keyboard import get_category_keyboard, get_category_filter_keyboard, get_task_actions_keyboard
 
 # Создаем роутер для обработчиков команд
 router = Router()
 
+logger = logging.getLogger(__name__)
+
+# Иконки для категорий
+CATEGORY_ICONS = {
+    "DataBase": "💾",
+    "Frontend": "🎨",
+    "Backend": "⚙️",
+    "Business": "💼"
+}
+
+# Максимальная длина сообщения в Telegram
+MESSAGE_MAX_LENGTH = 4096
+
+# Сколько символов текста задачи показывается в списке задач
+TASK_TEXT_PREVIEW_LENGTH = 1000
+
+# Подписи для статусов задач
+STATUS_LABELS = {
+    "open": "🆕 Открыта",
+    "in_progress": "🔧 В работе",
+    "done": "✔️ Выполнена"
+}
+
+
+async def get_user_name(bot, user_id: int, user_info_cache: dict) -> str:
+    """
+    Получает отображаемое имя пользователя Telegram.
+    Уже полученные имена берутся из user_info_cache, чтобы не запрашивать их повторно.
+    """
+    if user_id not in user_info_cache:
+        try:
+            # Пытаемся получить информацию о пользователе через бота
+            chat = await bot.get_chat(user_id)
+            # Формируем имя пользователя: сначала пробуем полное имя, потом username, потом ID
+            if chat.first_name:
+                user_name = f"{chat.first_name}"
+                if chat.last_name:
+                    user_name += f" {chat.last_name}"
+                if chat.username:
+                    user_name += f" (@{chat.username})"
+            elif chat.username:
+                user_name = f"@{chat.username}"
+            else:
+                user_name = f"Пользователь {user_id}"
+            user_info_cache[user_id] = user_name
+        except Exception:
+            # Если не удалось получить информацию (пользователь не взаимодействовал с ботом), используем ID
+            user_info_cache[user_id] = f"Пользователь {user_id}"
+    
+    return user_info_cache[user_id]
+
+
+def parse_tasks_view(view: str):
+    """
+    Разбирает строку с описанием списка задач (приходит из callback_data).
+    
+    Args:
+        view: "list:<ID>" - активные задачи чата после задачи с указанным ID,
+              "cat:<категория>:<ID>" - активные задачи категории после задачи с указанным ID,
+              "done:<ID>" - выполненные задачи с ID меньше указанного
+              (ID 0 или его отсутствие - первая страница)
+    
+    Returns:
+        Тройка (вид списка, категория или None, ID задачи, с которой продолжается список)
+    
+    Raises:
+        ValueError: если строка не описывает ни один список
+    """
+    if view.startswith("cat:"):
+        category, _, cursor_id = view.replace("cat:", "", 1).partition(":")
+        if category not in CATEGORY_ICONS:
+            raise ValueError(f"Неизвестная категория: {category}")
+        return "cat", category, int(cursor_id or 0)
+    
+    kind, _, cursor_id = view.partition(":")
+    if kind not in ("list", "done"):
+        raise ValueError(f"Неизвестный список задач: {view}")
+    
+    return kind, None, int(cursor_id or 0)
+
+
+def _telegram_length(text: str) -> int:
+    """
+    Длина текста так, как её считает Telegram (в единицах UTF-16: эмодзи занимают две).
+    """
+    return len(text.encode('utf-16-le')) // 2
+
+
+async def render_tasks_view(bot, chat_id: int, viewer_id: int, view: str):
+    """
+    Формирует текст и клавиатуру для одной страницы списка задач.
+    На страницу попадает не больше TASKS_PAGE_SIZE (DONE_PAGE_SIZE для выполненных) задач,
+    и не больше, чем помещается в одно сообщение Telegram.
+    
+    Args:
+        bot: Объект бота (для получения имен пользователей)
+        chat_id: ID чата, задачи которого показываются
+        viewer_id: ID пользователя, который смотрит список (его задачи отмечаются иконкой)
+        view: Какой список показать (см. parse_tasks_view)
+    
+    Returns:
+        Пара (текст, клавиатура); клавиатура равна None, если задач нет
+    """
+    kind, category, cursor_id = parse_tasks_view(view)
+    
+    # Запрашиваем на одну задачу больше страницы, чтобы узнать, есть ли следующая
+    if kind == "cat":
+        # Активные задачи выбранной категории
+        page_size = TASKS_PAGE_SIZE
+        tasks = list(iter_tasks_by_category(chat_id, category, after_id=cursor_id, limit=page_size + 1))
+        tasks_text = f"📋 Задачи категории {category}:\n\n"
+        empty_text = f"📋 В категории '{category}' пока нет задач."
+    elif kind == "done":
+        # Выполненные задачи (от новых к старым)
+        page_size = DONE_PAGE_SIZE
+        tasks = get_done_tasks(chat_id, page_size + 1, cursor_id or None)
+        tasks_text = "✔️ Выполненные задачи команды:\n\n"
+        empty_text = "✔️ Выполненных задач пока нет."
+    else:
+        # Активные задачи команды (не только текущего пользователя)
+        page_size = TASKS_PAGE_SIZE
+        tasks = list(iter_tasks(chat_id, include_done=False, after_id=cursor_id, limit=page_size + 1))
+        tasks_text = "📋 Задачи команды:\n\n"
+        empty_text = "📋 В команде пока нет задач. Добавьте первую задачу командой /add"
+    
+    if not tasks:
+        return empty_text, None
+    
+    # Подсказка к кнопкам под списком
+    footer = "\nКнопки: 🆕 открыть, 🔧 в работу, ✔️ выполнено, 🙋 взять себе"
+    
+    # Получаем информацию о пользователях для отображения имен
+    user_info_cache = {}
+    
+    shown_tasks = []
+    text_length = _telegram_length(tasks_text) + _telegram_length(footer)
+    
+    for task in tasks[:page_size]:
+        user_name = await get_user_name(bot, task.user, user_info_cache)
+        
+        # Определяем иконку в зависимости от того, принадлежит ли задача текущему пользователю
+        icon = "✅" if task.user == viewer_id else "📝"
+        
+        # Получаем иконку категории
+        category_icon = CATEGORY_ICONS.get(task.category, "📋")
+        
+        # Очень длинный текст задачи сокращаем, чтобы задача целиком поместилась в сообщение
+        text = task.text
+        if len(text) > TASK_TEXT_PREVIEW_LENGTH:
+            text = text[:TASK_TEXT_PREVIEW_LENGTH] + "…"
+        
+        task_text = f"{icon} Задача #{task.id}\n"
+        task_text += f"   Текст: {text}\n"
+        task_text += f"   Категория: {category_icon} {task.category}\n"
+        task_text += f"   Статус: {STATUS_LABELS.get(task.status, task.status)}\n"
+        task_text += f"   Автор: 👤 {user_name}\n"
+        if task.assignee:
+            assignee_name = await get_user_name(bot, task.assignee, user_info_cache)
+            task_text += f"   Исполнитель: 🙋 {assignee_name}\n"
+        task_text += f"   Создано: 📅 {task.created_at}\n"
+        task_text += "─" * 30 + "\n"
+        
+        # Остальные задачи переходят на следующую страницу, если сообщение стало бы слишком длинным
+        if shown_tasks and text_length + _telegram_length(task_text) > MESSAGE_MAX_LENGTH:
+            break
+        
+        shown_tasks.append(task)
+        tasks_text += task_text
+        text_length += _telegram_length(task_text)
+    
+    tasks_text += footer
+    
+    # Следующая страница продолжается после последней показанной задачи
+    next_view = None
+    if len(shown_tasks) < len(tasks):
+        last_id = shown_tasks[-1].id
+        if kind == "cat":
+            next_view = f"cat:{category}:{last_id}"
+        else:
+            next_view = f"{kind}:{last_id}"
+    
+    keyboard = get_task_actions_keyboard(
+        [(task.id, task.status) for task in shown_tasks],
+        view,
+        next_view
+    )
+    
+    return tasks_text, keyboard
+
+
+async def refresh_tasks_view(callback: CallbackQuery, view: str) -> bool:
+    """
+    Перерисовывает список задач в сообщении, под которым нажата кнопка.
+    
+    Returns:
+        True если сообщение обновлено (или не изменилось), False если Telegram отклонил изменение
+    """
+    tasks_text, keyboard = await render_tasks_view(
+        callback.message.bot, callback.message.chat.id, callback.from_user.id, view
+    )
+    
+    try:
+        await callback.message.edit_text(tasks_text, reply_markup=keyboard)
+    except TelegramBadRequest as error:
+        # Telegram не дает редактировать сообщение, если текст и кнопки не изменились - это не ошибка
+        if "message is not modified" in str(error):
+            return True
+        logger.exception("Не удалось обновить список задач")
+        return False
+    
+    return True
+
 
 @router.message(Command("start"))
 async def cmd_start(message: Message, state: FSMContext):
@@ -31,7 +252,10 @@ async def cmd_start(message: Message, state: FSMContext):
         "Доступные команды:\n"
         "/add - Добавить новую задачу\n"
         "/delete - Удалить задачу по ID\n"
-        "/list - Показать все задачи\n"
+        "/undo - Восстановить последнюю удаленную задачу\n"
+        "/list - Показать активные задачи\n"
+        "/list_done - Показать выполненные задачи\n"
+        "/assign - Назначить исполнителя задачи\n"
         "/list_category - Показать задачи по категории\n"
         "/list_csv - Экспортировать задачи в CSV файл\n\n"
         "Начните с команды /add для добавления первой задачи!"
@@ -69,77 +293,58 @@ async def cmd_delete(message: Message, state: FSMContext):
     )
 
 
+@router.message(Command("undo"))
+async def cmd_undo(message: Message, state: FSMContext):
+    """
+    Обработчик команды /undo.
+    Восстанавливает последнюю удаленную пользователем задачу,
+    если окно отмены удаления еще не истекло.
+    """
+    # Сбрасываем состояние (команда прерывает процесс добавления/удаления)
+    await state.clear()
+    
+    # Пытаемся восстановить последнюю удаленную задачу
+    task_id = restore_last_deleted_task(message.from_user.id, message.chat.id)
+    
+    if task_id is not None:
+        await message.answer(f"↩️ Задача с ID {task_id} восстановлена!")
+    else:
+        await message.answer(
+            "❌ Нет задач, удаление которых можно отменить.\n"
+            f"Удаление можно отменить в течение {UNDO_WINDOW_SECONDS // 60} мин."
+        )
+
+
 @router.message(Command("list"))
 async def cmd_list(message: Message, state: FSMContext):
     """
     Обработчик команды /list.
-    Показывает все задачи команды в виде списка с указанием автора каждой задачи.
+    Показывает активные (не выполненные) задачи команды (текущего чата) в виде списка
+    с указанием автора каждой задачи и кнопками для смены статуса.
     """
     # Сбрасываем состояние (команда прерывает процесс добавления/удаления)
     await state.clear()
     
-    # Получаем все задачи команды (не только текущего пользователя)
-    tasks = get_all_tasks(user_id=None)
-    
-    if not tasks:
-        # Если задач нет
-        await message.answer("📋 В команде пока нет задач. Добавьте первую задачу командой /add")
-        return
+    # Формируем список активных задач команды в этом чате
+    tasks_text, keyboard = await render_tasks_view(message.bot, message.chat.id, message.from_user.id, "list:0")
     
-    # Формируем текст со списком задач
-    tasks_text = "📋 Задачи команды:\n\n"
-    
-    # Получаем информацию о пользователях для отображения имен
-    user_info_cache = {}
+    # Отправляем первую страницу списка задач
+    await message.answer(tasks_text, reply_markup=keyboard)
+
+
+@router.message(Command("list_done"))
+async def cmd_list_done(message: Message, state: FSMContext):
+    """
+    Обработчик команды /list_done.
+    Показывает первую страницу выполненных задач команды (от новых к старым).
+    """
+    # Сбрасываем состояние (команда прерывает процесс добавления/удаления)
+    await state.clear()
     
-    # Иконки для категорий
-    category_icons = {
-        "DataBase": "💾",
-        "Frontend": "🎨",
-        "Backend": "⚙️",
-        "Business": "💼"
-    }
-    
-    for task_id, text, user_id, category, created_at in tasks:
-        # Получаем информацию о пользователе
-        if user_id not in user_info_cache:
-            try:
-                # Пытаемся получить информацию о пользователе через бота
-                chat = await message.bot.get_chat(user_id)
-                # Формируем имя пользователя: сначала пробуем полное имя, потом username, потом ID
-                if chat.first_name:
-                    user_name = f"{chat.first_name}"
-                    if chat.last_name:
-                        user_name += f" {chat.last_name}"
-                    if chat.username:
-                        user_name += f" (@{chat.username})"
-                elif chat.username:
-                    user_name = f"@{chat.username}"
-                else:
-                    user_name = f"Пользователь {user_id}"
-                user_info_cache[user_id] = user_name
-            except Exception:
-                # Если не удалось получить информацию (пользователь не взаимодействовал с ботом), используем ID
-                user_info_cache[user_id] = f"Пользователь {user_id}"
-        
-        user_name = user_info_cache[user_id]
-        
-        # Определяем иконку в зависимости от того, принадлежит ли задача текущему пользователю
-        icon = "✅" if user_id == message.from_user.id else "📝"
-        
-        # Получаем иконку категории
-        category_icon = category_icons.get(category, "📋")
-        
-        tasks_text += f"{icon} Задача #{task_id}\n"
-        tasks_text += f"   Текст: {text}\n"
-        tasks_text += f"   Категория: {category_icon} {category}\n"
-        tasks_text += f"   Автор: 👤 {user_name}\n"
-        tasks_text += f"   Создано: 📅 {created_at}\n"
-        tasks_text += "─" * 30 + "\n"
+    # Формируем первую страницу выполненных задач
+    tasks_text, keyboard = await render_tasks_view(message.bot, message.chat.id, message.from_user.id, "done:0")
     
-    # Отправляем список задач
-    # Если сообщение слишком длинное, Telegram разобьет его на части
-    await message.answer(tasks_text)
+    await message.answer(tasks_text, reply_markup=keyboard)
 
 
 @router.message(Command("list_category"))
@@ -170,121 +375,239 @@ async def process_category_filter(callback: CallbackQuery, state: FSMContext):
     # Извлекаем категорию из callback_data (format: "filter_category_DataBase")
     category = callback.data.replace("filter_category_", "")
     
+    view = f"cat:{category}:0"
+
     # Сбрасываем состояние
     await state.clear()
+
+    try:
+        # Проверяем, что категория из кнопки существует
+        parse_tasks_view(view)
+    except ValueError:
+        await callback.answer("❌ Некорректная кнопка. Откройте список заново.", show_alert=True)
+        return
+
+    # Редактируем сообщение с кнопками, заменяя его на список активных задач категории
+    await refresh_tasks_view(callback, view)
+    
+    # Подтверждаем обработку callback
+    await callback.answer()
+
+
+@router.callback_query(F.data.startswith("task_status:"))
+async def process_task_status(callback: CallbackQuery):
+    """
+    Обработчик кнопок смены статуса задачи.
+    Вызывается когда пользователь нажимает кнопку под списком задач.
+    """
+    try:
+        # Извлекаем данные из callback_data (format: "task_status:5:in_progress:list:0")
+        _, task_id, status, view = callback.data.split(":", 3)
+        task_id = int(task_id)
+        parse_tasks_view(view)
+    except ValueError:
+        await callback.answer("❌ Некорректная кнопка. Откройте список заново.", show_alert=True)
+        return
     
-    # Получаем задачи по выбранной категории
-    tasks = get_tasks_by_category(category)
+    if status not in TASK_STATUSES:
+        await callback.answer(f"❌ Неизвестный статус задачи: {status}", show_alert=True)
+        return
     
-    if not tasks:
-        # Если задач нет
-        await callback.message.edit_text(
-            f"📋 В категории '{category}' пока нет задач."
+    # Меняем статус задачи в этом чате
+    updated = set_task_status(task_id, callback.message.chat.id, status)
+    
+    if not updated:
+        await callback.answer(f"❌ Задача #{task_id} не найдена", show_alert=True)
+        return
+    
+    # Обновляем список, чтобы показать новый статус
+    if not await refresh_tasks_view(callback, view):
+        await callback.answer(
+            f"Задача #{task_id}: {STATUS_LABELS[status]}\n"
+            "Не удалось обновить список - откройте его заново.",
+            show_alert=True
         )
-        await callback.answer()
         return
     
-    # Формируем текст со списком задач
-    tasks_text = f"📋 Задачи категории {category}:\n\n"
+    await callback.answer(f"Задача #{task_id}: {STATUS_LABELS[status]}")
+
+
+@router.callback_query(F.data.startswith("task_assign:"))
+async def process_task_assign(callback: CallbackQuery):
+    """
+    Обработчик кнопки "взять задачу себе".
+    Назначает исполнителем задачи пользователя, который нажал кнопку.
+    """
+    try:
+        # Извлекаем данные из callback_data (format: "task_assign:5:list:0")
+        _, task_id, view = callback.data.split(":", 2)
+        task_id = int(task_id)
+        parse_tasks_view(view)
+    except ValueError:
+        await callback.answer("❌ Некорректная кнопка. Откройте список заново.", show_alert=True)
+        return
     
-    # Получаем информацию о пользователях для отображения имен
-    user_info_cache = {}
+    # Назначаем исполнителем нажавшего кнопку
+    updated = assign_task(task_id, callback.message.chat.id, callback.from_user.id)
     
-    # Иконки для категорий
-    category_icons = {
-        "DataBase": "💾",
-        "Frontend": "🎨",
-        "Backend": "⚙️",
-        "Business": "💼"
-    }
-    
-    category_icon = category_icons.get(category, "📋")
-    
-    for task_id, text, user_id, task_category, created_at in tasks:
-        # Получаем информацию о пользователе
-        if user_id not in user_info_cache:
-            try:
-                # Пытаемся получить информацию о пользователе через бота
-                chat = await callback.message.bot.get_chat(user_id)
-                # Формируем имя пользователя: сначала пробуем полное имя, потом username, потом ID
-                if chat.first_name:
-                    user_name = f"{chat.first_name}"
-                    if chat.last_name:
-                        user_name += f" {chat.last_name}"
-                    if chat.username:
-                        user_name += f" (@{chat.username})"
-                elif chat.username:
-                    user_name = f"@{chat.username}"
-                else:
-                    user_name = f"Пользователь {user_id}"
-                user_info_cache[user_id] = user_name
-            except Exception:
-                # Если не удалось получить информацию (пользователь не взаимодействовал с ботом), используем ID
-                user_info_cache[user_id] = f"Пользователь {user_id}"
-        
-        user_name = user_info_cache[user_id]
-        
-        # Определяем иконку в зависимости от того, принадлежит ли задача текущему пользователю
-        icon = "✅" if user_id == callback.from_user.id else "📝"
-        
-        tasks_text += f"{icon} Задача #{task_id}\n"
-        tasks_text += f"   Текст: {text}\n"
-        tasks_text += f"   Категория: {category_icon} {task_category}\n"
-        tasks_text += f"   Автор: 👤 {user_name}\n"
-        tasks_text += f"   Создано: 📅 {created_at}\n"
-        tasks_text += "─" * 30 + "\n"
+    if not updated:
+        await callback.answer(f"❌ Задача #{task_id} не найдена", show_alert=True)
+        return
     
-    # Редактируем сообщение с кнопками, заменяя его на список задач
-    await callback.message.edit_text(tasks_text)
+    # Обновляем список, чтобы показать исполнителя
+    if not await refresh_tasks_view(callback, view):
+        await callback.answer(
+            f"🙋 Вы исполнитель задачи #{task_id}\n"
+            "Не удалось обновить список - откройте его заново.",
+            show_alert=True
+        )
+        return
+    
+    await callback.answer(f"🙋 Вы исполнитель задачи #{task_id}")
+
+
+@router.callback_query(F.data.startswith("tasks_page:"))
+async def process_tasks_page(callback: CallbackQuery):
+    """
+    Обработчик кнопки перехода на следующую страницу списка задач.
+    """
+    # Извлекаем список, который нужно показать (format: "tasks_page:done:42")
+    view = callback.data.replace("tasks_page:", "", 1)
+    
+    try:
+        parse_tasks_view(view)
+    except ValueError:
+        await callback.answer("❌ Некорректная кнопка. Откройте список заново.", show_alert=True)
+        return
+    
+    if not await refresh_tasks_view(callback, view):
+        await callback.answer("Не удалось показать страницу - откройте список заново.", show_alert=True)
+        return
     
-    # Подтверждаем обработку callback
     await callback.answer()
 
 
+@router.message(Command("assign"))
+async def cmd_assign(message: Message, state: FSMContext):
+    """
+    Обработчик команды /assign.
+    Устанавливает состояние ожидания ID задачи, которой нужно назначить исполнителя.
+    """
+    # Устанавливаем состояние ожидания ID задачи
+    await state.set_state(TaskStates.waiting_for_assign_task_id)
+    
+    await message.answer(
+        "🙋 Введите ID задачи, которой нужно назначить исполнителя:\n"
+        "(Для отмены отправьте /start или любую другую команду)"
+    )
+
+
 @router.message(Command("list_csv"))
 async def cmd_list_csv(message: Message, state: FSMContext):
     """
     Обработчик команды /list_csv.
-    Экспортирует все задачи пользователя в CSV файл и отправляет его пользователю.
+    Экспортирует все задачи пользователя в текущем чате (включая выполненные) в CSV файл и отправляет его пользователю.
+    Если данные не менялись с прошлой выгрузки, файл повторно не формируется:
+    отправляется сохраненный file_id из Telegram.
     """
     # Сбрасываем состояние (команда прерывает процесс добавления/удаления)
     await state.clear()
     
-    # Получаем все задачи текущего пользователя
-    tasks = get_all_tasks(user_id=message.from_user.id)
-    
-    if not tasks:
-        await message.answer(
-            "📋 У вас пока нет задач для экспорта. "
-            "Добавьте первую задачу командой /add"
-        )
-        return
-    
-    # Создаем CSV файл в памяти
-    # Используем точку с запятой (;) как разделитель для лучшей совместимости с Excel
-    csv_buffer = io.StringIO()
-    csv_writer = csv.writer(csv_buffer, delimiter=';')
-    
-    # Записываем заголовки столбцов
-    csv_writer.writerow(['ID', 'Текст', 'Категория', 'Пользователь', 'Дата создания'])
-    
-    # Записываем задачи (task содержит: id, text, user, category, created_at)
-    # Переставляем порядок для CSV: id, text, category, user, created_at
-    for task in tasks:
-        task_id, text, user_id, category, created_at = task
-        csv_writer.writerow([task_id, text, category, user_id, created_at])
-    
-    # Преобразуем текст в байты (UTF-8 с BOM для правильного отображения в Excel)
-    csv_bytes = csv_buffer.getvalue().encode('utf-8-sig')
+    caption = "📊 Ваши задачи в формате CSV"
+    
+    # Выгрузка кэшируется для каждого пользователя в каждом чате и версии данных чата
+    # Версию запоминаем до чтения задач: если задачи изменятся во время выгрузки,
+    # запись в кэше просто окажется устаревшей
+    scope = (message.chat.id, message.from_user.id)
+    version = get_data_version(message.chat.id)
+    cached = get_export(scope, version)
+    
+    if cached and cached["file_id"]:
+        try:
+            # Отправляем уже загруженный в Telegram файл по его file_id
+            await message.answer_document(cached["file_id"], caption=caption)
+            return
+        except TelegramBadRequest:
+            # Telegram не принял file_id - забываем его и отправляем файл заново
+            set_export_file_id(scope, version, None)
+    
+    if cached:
+        # CSV уже сформирован для этой версии данных
+        csv_bytes = cached["csv"]
+    else:
+        # Создаем CSV файл в памяти
+        # Используем точку с запятой (;) как разделитель для лучшей совместимости с Excel
+        csv_buffer = io.StringIO()
+        csv_writer = csv.writer(csv_buffer, delimiter=';')
+        
+        # Записываем заголовки столбцов
+        csv_writer.writerow(['ID', 'Текст', 'Категория', 'Статус', 'Пользователь', 'Исполнитель', 'Дата создания'])
+        
+        # Записываем все задачи текущего пользователя в этом чате
+        # Задачи читаются из базы порциями и сразу записываются в CSV, не накапливаясь в списке
+        # Порядок столбцов в CSV: id, text, category, status, user, assignee, created_at
+        tasks_count = 0
+        for task in iter_tasks(message.chat.id, user_id=message.from_user.id, include_done=True):
+            csv_writer.writerow([
+                task.id, task.text, task.category, task.status, task.user, task.assignee or '', task.created_at
+            ])
+            tasks_count += 1
+        
+        if tasks_count == 0:
+            await message.answer(
+                "📋 У вас пока нет задач для экспорта. "
+                "Добавьте первую задачу командой /add"
+            )
+            return
+        
+        # Преобразуем текст в байты (UTF-8 с BOM для правильного отображения в Excel)
+        csv_bytes = csv_buffer.getvalue().encode('utf-8-sig')
+        
+        # Сохраняем сформированный файл в кэш
+        save_export(scope, version, csv_bytes)
     
     # В aiogram 3.x нужно использовать BufferedInputFile для отправки файлов из памяти
     # Создаем BufferedInputFile из байтов
     document = BufferedInputFile(csv_bytes, filename='tasks.csv')
     
     # Отправляем CSV файл пользователю
-    await message.answer_document(
+    sent = await message.answer_document(
         document,
-        caption="📊 Ваши задачи в формате CSV"
+        caption=caption
+    )
+    
+    # Запоминаем file_id, чтобы в следующий раз не загружать файл повторно
+    if sent.document:
+        set_export_file_id(scope, version, sent.document.file_id)
+
+
+@router.message(Command("backup"))
+async def cmd_backup(message: Message, state: FSMContext):
+    """
+    Обработчик команды /backup.
+    Создает резервную копию базы данных (доступно только администраторам бота).
+    """
+    # Сбрасываем состояние (команда прерывает процесс добавления/удаления)
+    await state.clear()
+    
+    if message.from_user.id not in ADMIN_IDS:
+        await message.answer("⛔ Команда доступна только администраторам бота.")
+        return
+    
+    await message.answer("⏳ Создаю резервную копию базы данных...")
+    
+    try:
+        # Копирование идет в фоне, бот продолжает отвечать на сообщения
+        snapshot_path = await create_backup()
+    except Exception:
+        logger.exception("Ошибка при создании резервной копии базы данных")
+        await message.answer("❌ Не удалось создать резервную копию. Подробности в логе бота.")
+        return
+    
+    await message.answer(
+        f"✅ Резервная копия создана!\n"
+        f"Файл: {os.path.basename(snapshot_path)}\n"
+        f"Размер: {os.path.getsize(snapshot_path)} байт"
     )
 
 
@@ -339,19 +662,13 @@ async def process_category_selection(callback: CallbackQuery, state: FSMContext)
         return
     
     # Добавляем задачу в базу данных с выбранной категорией
-    task_id = add_task(task_text, callback.from_user.id, category)
+    task_id = add_task(task_text, callback.from_user.id, callback.message.chat.id, category)
     
     # Сбрасываем состояние
     await state.clear()
     
     # Определяем иконку категории для отображения
-    category_icons = {
-        "DataBase": "💾",
-        "Frontend": "🎨",
-        "Backend": "⚙️",
-        "Business": "💼"
-    }
-    category_icon = category_icons.get(category, "📋")
+    category_icon = CATEGORY_ICONS.get(category, "📋")
     
     # Отправляем подтверждение пользователю
     await callback.message.edit_text(
@@ -376,13 +693,16 @@ async def process_task_id(message: Message, state: FSMContext):
         task_id = int(message.text.strip())
         
         # Пытаемся удалить задачу
-        deleted = delete_task(task_id, message.from_user.id)
+        deleted = delete_task(task_id, message.from_user.id, message.chat.id)
         
         # Сбрасываем состояние
         await state.clear()
         
         if deleted:
-            await message.answer(f"✅ Задача с ID {task_id} успешно удалена!")
+            await message.answer(
+                f"✅ Задача с ID {task_id} успешно удалена!\n"
+                f"Чтобы отменить удаление, отправьте /undo в течение {UNDO_WINDOW_SECONDS // 60} мин."
+            )
         else:
             await message.answer(
                 f"❌ Задача с ID {task_id} не найдена или не принадлежит вам."
@@ -394,6 +714,80 @@ async def process_task_id(message: Message, state: FSMContext):
         )
 
 
+@router.message(StateFilter(TaskStates.waiting_for_assign_task_id))
+async def process_assign_task_id(message: Message, state: FSMContext):
+    """
+    Обработчик для получения ID задачи (в состоянии waiting_for_assign_task_id).
+    Вызывается после команды /assign, когда пользователь отправляет ID задачи.
+    Проверяет, что задача есть в этом чате, и просит указать исполнителя.
+    """
+    try:
+        # Пытаемся преобразовать текст в число (ID задачи)
+        task_id = int(message.text.strip())
+    except (ValueError, AttributeError):
+        # Если не удалось преобразовать в число (или прислали не текст)
+        await message.answer(
+            "❌ ID задачи должен быть числом. Попробуйте еще раз:"
+        )
+        return
+    
+    # Проверяем, что такая задача есть в этом чате
+    if get_task_by_id(task_id, message.chat.id) is None:
+        await state.clear()
+        await message.answer(f"❌ Задача с ID {task_id} не найдена.")
+        return
+    
+    # Сохраняем ID задачи во временное хранилище состояния
+    await state.update_data(assign_task_id=task_id)
+    
+    # Переходим к состоянию ожидания исполнителя
+    await state.set_state(TaskStates.waiting_for_assignee)
+    
+    await message.answer(
+        "🙋 Перешлите сюда любое сообщение участника, которого нужно назначить исполнителем,\n"
+        "или отправьте его числовой ID в Telegram:"
+    )
+
+
+@router.message(StateFilter(TaskStates.waiting_for_assignee))
+async def process_assignee(message: Message, state: FSMContext):
+    """
+    Обработчик для получения исполнителя задачи (в состоянии waiting_for_assignee).
+    Исполнитель определяется по пересланному сообщению участника или по его числовому ID.
+    """
+    # Получаем сохраненный ID задачи из состояния
+    data = await state.get_data()
+    task_id = data.get("assign_task_id")
+    
+    # Определяем исполнителя
+    origin = message.forward_origin
+    if origin is not None and origin.type == "user":
+        # Переслано сообщение участника - берем его ID
+        assignee_id = origin.sender_user.id
+    elif message.text and message.text.strip().isdigit():
+        # Отправлен числовой ID участника
+        assignee_id = int(message.text.strip())
+    else:
+        # Например, участник скрыл свой аккаунт в пересланных сообщениях
+        await message.answer(
+            "❌ Не удалось определить участника. "
+            "Отправьте его числовой ID в Telegram или перешлите другое сообщение:"
+        )
+        return
+    
+    # Назначаем исполнителя
+    assigned = assign_task(task_id, message.chat.id, assignee_id)
+    
+    # Сбрасываем состояние
+    await state.clear()
+    
+    if assigned:
+        assignee_name = await get_user_name(message.bot, assignee_id, {})
+        await message.answer(f"✅ Исполнитель задачи #{task_id}: 🙋 {assignee_name}")
+    else:
+        await message.answer(f"❌ Задача с ID {task_id} не найдена.")
+
+
 @router.message()
 async def handle_other_messages(message: Message, state: FSMContext):
     """
@@ -410,7 +804,11 @@ async def handle_other_messages(message: Message, state: FSMContext):
         "/start - Начать работу\n"
         "/add - Добавить задачу\n"
         "/delete - Удалить задачу\n"
-        "/list - Показать все задачи\n"
+        "/undo - Отменить удаление\n"
+        "/list - Показать активные задачи\n"
+        "/list_done - Показать выполненные задачи\n"
+        "/assign - Назначить исполнителя задачи\n"
+        "/list_category - Показать задачи по категории\n"
         "/list_csv - Экспортировать задачи в CSV"
     )
 
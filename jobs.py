@@ -0,0 +1,106 @@
+"""
+Модуль с фоновыми задачами бота.
+Здесь находятся периодические задачи обслуживания базы данных,
+которые работают параллельно с обработкой сообщений.
+"""
+import asyncio
+import logging
+import os
+import time
+
+from config import (
+    COMPACTION_INTERVAL_SECONDS, COMPACTION_BATCH_SIZE, COMPACTION_VACUUM_PAGES, BACKUP_INTERVAL_SECONDS,
+    BACKUP_RETRY_SECONDS
+)
+from database import purge_deleted_tasks, incremental_vacuum, get_database_stats
+from backup import create_backup, list_backups
+
+logger = logging.getLogger(__name__)
+
+
+async def run_compaction():
+    """
+    Один проход очистки базы данных.
+    Окончательно стирает удаленные задачи, у которых истекло окно /undo,
+    и возвращает освободившиеся страницы файловой системе.
+    Работа идет небольшими порциями, между порциями управление отдается
+    обработчикам сообщений.
+    """
+    started = time.perf_counter()
+    before = get_database_stats()
+
+    # Стираем удаленные задачи порциями, пока они не закончатся
+    purged = 0
+    while True:
+        batch = purge_deleted_tasks(COMPACTION_BATCH_SIZE)
+        purged += batch
+        if batch < COMPACTION_BATCH_SIZE:
+            break
+        # Даем поработать обработчикам сообщений
+        await asyncio.sleep(0)
+
+    # Освобождаем свободные страницы файла порциями
+    freelist_count = None
+    while True:
+        remaining = incremental_vacuum(COMPACTION_VACUUM_PAGES)
+        if remaining == 0 or remaining == freelist_count:
+            # Свободных страниц не осталось или они больше не освобождаются
+            break
+        freelist_count = remaining
+        await asyncio.sleep(0)
+
+    after = get_database_stats()
+    elapsed = time.perf_counter() - started
+
+    logger.info(
+        "Очистка базы данных: стерто задач %d, размер файла %d -> %d байт, "
+        "свободных страниц %d -> %d, заняло %.3f с",
+        purged,
+        before["file_size"], after["file_size"],
+        before["freelist_count"], after["freelist_count"],
+        elapsed
+    )
+
+
+async def compaction_job():
+    """
+    Фоновая задача, которая периодически запускает очистку базы данных.
+    """
+    while True:
+        try:
+            await run_compaction()
+        except Exception:
+            # Ошибка очистки не должна останавливать бота - попробуем в следующий раз
+            logger.exception("Ошибка при очистке базы данных")
+
+        await asyncio.sleep(COMPACTION_INTERVAL_SECONDS)
+
+
+async def backup_job():
+    """
+    Фоновая задача, которая периодически создает резервную копию базы данных.
+    Время до следующей копии считается от самого свежего снимка,
+    поэтому перезапуски бота не откладывают резервное копирование.
+    """
+    while True:
+        try:
+            # Если снимков нет или самый свежий старше интервала - копируем сразу
+            # (снимок может исчезнуть между list_backups и getmtime, поэтому проверка тоже внутри try)
+            backups = list_backups()
+            if backups:
+                wait = BACKUP_INTERVAL_SECONDS - (time.time() - os.path.getmtime(backups[-1]))
+                if wait > 0:
+                    # После ожидания проверяем снова: за это время мог появиться снимок от /backup
+                    await asyncio.sleep(wait)
+                    continue
+
+            started = time.perf_counter()
+            snapshot_path = await create_backup()
+            logger.info(
+                "Резервная копия базы данных создана: %s (%d байт), заняло %.3f с",
+                snapshot_path, os.path.getsize(snapshot_path), time.perf_counter() - started
+            )
+        except Exception:
+            # Ошибка копирования не должна останавливать бота - попробуем позже
+            logger.exception("Ошибка при создании резервной копии базы данных")
+            await asyncio.sleep(BACKUP_RETRY_SECONDS)
@@ -4,6 +4,10 @@
 """
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
+# Telegram разрешает не больше 100 кнопок в одной клавиатуре,
+# поэтому кнопки добавляются только для первых 30 задач списка (по 3 кнопки на задачу)
+TASK_BUTTONS_LIMIT = 30
+
 
 def get_category_keyboard():
     """
@@ -54,3 +58,55 @@ def get_category_filter_keyboard():
     
     return keyboard
 
+
+def get_task_actions_keyboard(tasks, view: str, next_view: str = None):
+    """
+    Создает клавиатуру с кнопками действий для каждой задачи в списке:
+    смена статуса и назначение исполнителем себя.
+    
+    Args:
+        tasks: Список пар (ID задачи, статус задачи)
+        view: Текущий список задач ("list:<ID>", "cat:<категория>:<ID>" или "done:<ID>"),
+              чтобы после нажатия кнопки обновить именно его
+        next_view: Если указан, добавляется кнопка перехода на следующую страницу
+    
+    Returns:
+        InlineKeyboardMarkup с кнопками действий
+    """
+    # Иконки кнопок для перевода задачи в каждый статус
+    status_icons = {
+        "open": "🆕",
+        "in_progress": "🔧",
+        "done": "✔️"
+    }
+    
+    buttons = []
+    
+    for task_id, status in tasks[:TASK_BUTTONS_LIMIT]:
+        row = []
+        
+        # Кнопки для перевода задачи в любой статус, кроме текущего
+        for new_status, icon in status_icons.items():
+            if new_status != status:
+                row.append(InlineKeyboardButton(
+                    text=f"{icon} #{task_id}",
+                    callback_data=f"task_status:{task_id}:{new_status}:{view}"
+                ))
+        
+        # Кнопка "взять задачу себе"
+        row.append(InlineKeyboardButton(
+            text=f"🙋 #{task_id}",
+            callback_data=f"task_assign:{task_id}:{view}"
+        ))
+        
+        buttons.append(row)
+    
+    if next_view:
+        # Кнопка перехода на следующую страницу списка
+        buttons.append([InlineKeyboardButton(text="Далее ➡️", callback_data=f"tasks_page:{next_view}")])
+    
+    # Создаем клавиатуру из кнопок
+    keyboard = InlineKeyboardMarkup(inline_keyboard=buttons)
+    
+    return keyboard
+
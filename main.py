@@ -2,6 +2,7 @@
 Главный файл приложения - точка входа в программу.
 Здесь происходит инициализация бота и запуск приложения.
 """
+import argparse
 import asyncio
 import logging
 from aiogram import Bot, Dispatcher
@@ -12,6 +13,8 @@ from aiogram.fsm.storage.memory import MemoryStorage
 from config import BOT_TOKEN
 from database import init_database
 from handlers import router
+from jobs import compaction_job, backup_job
+from backup import restore_backup
 
 # Настраиваем логирование для отслеживания работы бота
 logging.basicConfig(
@@ -21,16 +24,24 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-async def main():
+async def main(restore_path: str = None):
     """
     Главная функция приложения.
     Инициализирует бота, регистрирует обработчики и запускает polling.
+    
+    Args:
+        restore_path: Если указан, перед запуском база данных восстанавливается из этого снимка
     """
     # Проверяем, что токен бота установлен
     if not BOT_TOKEN:
         logger.error("BOT_TOKEN не установлен! Создайте файл .env и добавьте BOT_TOKEN=ваш_токен")
         return
     
+    if restore_path:
+        # Восстанавливаем базу из снимка до того, как бот начнет с ней работать
+        snapshot_path = restore_backup(restore_path)
+        logger.info(f"База данных восстановлена из снимка {snapshot_path}")
+    
     # Инициализируем базу данных (создаем таблицу, если её нет)
     init_database()
     logger.info("База данных инициализирована")
@@ -52,10 +63,19 @@ async def main():
     # Регистрируем роутер с обработчиками команд
     dp.include_router(router)
     
+    # Запускаем фоновую очистку удаленных задач и резервное копирование
+    compaction_task = asyncio.create_task(compaction_job())
+    backup_task = asyncio.create_task(backup_job())
+    
     logger.info("Бот запущен и готов к работе!")
     
-    # Запускаем polling (процесс получения и обработки обновлений от Telegram)
-    await dp.start_polling(bot)
+    try:
+        # Запускаем polling (процесс получения и обработки обновлений от Telegram)
+        await dp.start_polling(bot)
+    finally:
+        # Останавливаем фоновые задачи вместе с ботом
+        compaction_task.cancel()
+        backup_task.cancel()
 
 
 if __name__ == "__main__":
@@ -63,9 +83,19 @@ if __name__ == "__main__":
     Точка входа в программу.
     Запускает асинхронную функцию main().
     """
+    # Разбираем аргументы командной строки
+    # Пример восстановления базы из самого свежего снимка: python main.py --restore latest
+    parser = argparse.ArgumentParser(description="Task Radar Bot")
+    parser.add_argument(
+        "--restore",
+        metavar="SNAPSHOT",
+        help="восстановить базу данных из снимка (путь к .db.gz или latest) перед запуском"
+    )
+    args = parser.parse_args()
+    
     try:
         # Запускаем главную функцию
-        asyncio.run(main())
+        asyncio.run(main(args.restore))
     except KeyboardInterrupt:
         # Если пользователь нажал Ctrl+C, корректно завершаем работу
         logger.info("Бот остановлен пользователем")
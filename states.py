@@ -20,4 +20,10 @@ class TaskStates(StatesGroup):
     
     # Состояние ожидания ID задачи для удаления (после команды /delete)
     waiting_for_task_id = State()
+    
+    # Состояние ожидания ID задачи для назначения исполнителя (после команды /assign)
+    waiting_for_assign_task_id = State()
+    
+    # Состояние ожидания исполнителя задачи (после ввода ID задачи в /assign)
+    waiting_for_assignee = State()
 